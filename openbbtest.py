@@ -1,9 +1,11 @@
 # Import required libraries
 import streamlit as st
 import openbb as obb
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go # For more complex plots if needed
+import asyncio
 import warnings
 from datetime import datetime
 
@@ -24,23 +26,184 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
+# Cap on points shipped to the browser per trace; beyond this the transfer
+# and render cost dominates and the extra points add no visual information
+MAX_PLOT_POINTS = 2000
+
 # --- Helper Functions ---
-def format_datetime_col(df, col_name):
-    """Safely formats a datetime column to string, handling potential errors."""
-    if col_name in df.columns:
-        try:
-            # Convert to datetime, coercing errors, then format
-            return pd.to_datetime(df[col_name], errors='coerce').dt.strftime('%Y-%m-%d %H:%M:%S')
-        except Exception:
-            return df[col_name] # Return original if formatting fails
+def lttb_downsample(df, x_col, y_col, n_out=MAX_PLOT_POINTS):
+    """Downsample a sorted series to at most n_out rows with LTTB.
+
+    Largest-Triangle-Three-Buckets keeps the points that preserve the
+    visual envelope of the series, so fat aggregates (thousands of
+    strikes) render with a fraction of the payload. Input must be sorted
+    by x_col; returns the input unchanged when it is already small enough.
+    """
+    n = len(df)
+    if n <= n_out or n_out < 3:
+        return df
+    x = df[x_col].to_numpy(dtype=np.float64)
+    y = df[y_col].to_numpy(dtype=np.float64)
+    # Endpoints are always kept; interior points fall into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    idx = np.empty(n_out, dtype=np.intp)
+    idx[0] = 0
+    idx[-1] = n - 1
+    anchor = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_hi = n if i == n_out - 3 else edges[i + 2]
+        avg_x = x[hi:nxt_hi].mean()
+        avg_y = y[hi:nxt_hi].mean()
+        # Triangle area of each candidate against the anchor and next-bucket average
+        area = np.abs((x[anchor] - avg_x) * (y[lo:hi] - y[anchor])
+                      - (x[anchor] - x[lo:hi]) * (avg_y - y[anchor]))
+        anchor = lo + int(area.argmax())
+        idx[i + 1] = anchor
+    return df.iloc[idx]
+
+def sum_by_key(keys, vals):
+    """Sum vals grouped by keys with a sort-then-reduceat pass.
+
+    Sorting once and reducing contiguous runs with np.add.reduceat skips
+    pandas' hashed groupby and its block-manager round trip; on chains
+    where strikes repeat across many expirations the contiguous-array
+    reduction is the faster path. Both inputs must be float64 arrays.
+    """
+    if keys.size == 0:
+        return keys, vals
+    order = np.argsort(keys, kind='stable')
+    k = keys[order]
+    v = vals[order]
+    starts = np.empty(k.size, dtype=np.bool_)
+    starts[0] = True
+    np.not_equal(k[1:], k[:-1], out=starts[1:])
+    start_idx = np.flatnonzero(starts)
+    return k[start_idx], np.add.reduceat(v, start_idx)
+
+# --- Cached Data Loading ---
+def _fetch_quote_price(ticker: str, provider: str):
+    """Last traded price from the equity quote endpoint, or None.
+
+    Used as a fallback when the chain itself carries no underlying_price.
+    Swallows provider errors: a missing quote must not fail the chain fetch.
+    """
+    try:
+        quote_df = obb.equity.price.quote(symbol=ticker, provider=provider).to_df()
+        for col in ('last_price', 'price', 'close'):
+            if col in quote_df.columns and pd.notna(quote_df[col].iloc[0]):
+                return float(quote_df[col].iloc[0])
+    except Exception:
+        pass
     return None
 
-def safe_get_first(series):
-    """Safely get the first element of a series/list if it's not empty."""
-    try:
-        return series.iloc[0] if not series.empty else None
-    except IndexError:
-        return None
+@st.cache_data(ttl=300, show_spinner=False)
+def load_chain(ticker: str, provider: str):
+    """Fetch the options chain and underlying quote concurrently.
+
+    Cached per (ticker, provider) so widget-triggered reruns (e.g. changing
+    the expiration dropdown) skip the network round trips and the cleanup
+    pass. Returns (options_df, quote_price); the DataFrame is empty if the
+    provider returns no usable data. OpenBB's Python interface is blocking,
+    so the two HTTPS round trips run in worker threads and overlap — the
+    wait is the max of the two legs rather than their sum.
+    """
+    async def _fetch_all():
+        return await asyncio.gather(
+            asyncio.to_thread(obb.derivatives.options.chains, symbol=ticker, provider=provider),
+            asyncio.to_thread(_fetch_quote_price, ticker, provider),
+        )
+
+    options_chain_result, quote_price = asyncio.run(_fetch_all())
+
+    if not (hasattr(options_chain_result, "to_df") and options_chain_result.results):
+        return pd.DataFrame(), quote_price
+
+    options_df = options_chain_result.to_df()
+    if options_df.empty:
+        return options_df, quote_price
+
+    # Standardize and Clean Columns (single bulk pass instead of per-column writes)
+    numeric_cols = [
+        'strike', 'open_interest', 'volume', 'implied_volatility',
+        'bid', 'ask', 'last_price', 'underlying_price',
+        'delta', 'gamma', 'theta', 'vega', 'rho'
+    ]
+    present_numeric = [c for c in numeric_cols if c in options_df.columns]
+    if present_numeric:
+        # downcast halves memory traffic in later groupbys and shrinks the
+        # Arrow payload shipped to the front-end
+        options_df[present_numeric] = options_df[present_numeric].apply(
+            pd.to_numeric, errors='coerce', downcast='float')
+    for count_col in ('open_interest', 'volume'):
+        # Counts are integral; nullable Int32 beats float64-with-NaN
+        if count_col in options_df.columns:
+            options_df[count_col] = options_df[count_col].astype('Int32')
+
+    # Handle dates (convert to string for selectbox consistency)
+    if 'expiration' in options_df.columns:
+        options_df['expiration'] = pd.to_datetime(options_df['expiration'], errors='coerce').dt.strftime('%Y-%m-%d')
+        options_df.dropna(subset=['expiration'], inplace=True)  # Remove rows where expiration conversion failed
+
+    # Keep other timestamp columns as datetime; they are formatted at render time
+    present_dt = [c for c in ('last_trade_time', 'bid_time', 'ask_time') if c in options_df.columns]
+    if present_dt:
+        options_df[present_dt] = options_df[present_dt].apply(pd.to_datetime, errors='coerce')
+
+    # Integer-keyed categorical makes downstream groupby hashing cheap
+    if 'option_type' in options_df.columns:
+        options_df['option_type'] = pd.Categorical(options_df['option_type'], categories=['call', 'put'])
+
+    return options_df, quote_price
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_expiration_pivot(ticker: str, provider: str) -> pd.DataFrame:
+    """Per-(expiration, strike, option_type) metric sums for the bar charts.
+
+    One hashed groupby across the full chain replaces a fresh scan each
+    time the user cycles the expiration selector; slicing the pivot by
+    expiration is then a cheap mask over a pre-aggregated frame.
+    """
+    options_df, _ = load_chain(ticker, provider)
+    group_cols = ['expiration', 'strike', 'option_type']
+    if options_df.empty or not set(group_cols).issubset(options_df.columns):
+        return pd.DataFrame()
+    metric_cols = [c for c in ('open_interest', 'volume', 'implied_volatility', 'bid', 'ask')
+                   if c in options_df.columns]
+    return (options_df.groupby(group_cols, sort=False, observed=True)[metric_cols]
+            .sum().reset_index())
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_expiration_groups(ticker: str, provider: str) -> dict:
+    """Pre-partition the chain by expiration date, sorted by strike/type.
+
+    Each value is an already-sorted slice of the full chain, so switching
+    expirations becomes a dict lookup instead of an O(N) mask plus a full
+    sort and copy on every rerun.
+    """
+    options_df, _ = load_chain(ticker, provider)
+    if options_df.empty or 'expiration' not in options_df.columns:
+        return {}
+    sorted_df = options_df.sort_values(by=['strike', 'option_type'])
+    return dict(tuple(sorted_df.groupby('expiration', sort=False)))
+
+@st.cache_data(ttl=300, show_spinner=False)
+def aggregate_oi(ticker: str, provider: str) -> pd.DataFrame:
+    """Total open interest per strike across all fetched expirations.
+
+    Memoized per (ticker, provider): the aggregate does not depend on the
+    expiration selector, so there is no reason to redo the coercion and
+    groupby scan on every widget interaction.
+    """
+    options_df, _ = load_chain(ticker, provider)
+    if options_df.empty or 'strike' not in options_df.columns or 'open_interest' not in options_df.columns:
+        return pd.DataFrame()
+    strikes = options_df['strike'].to_numpy(dtype=np.float64)
+    oi = options_df['open_interest'].to_numpy(dtype=np.float64, na_value=0.0)
+    valid = ~np.isnan(strikes)  # groupby dropped NaN keys; keep that behaviour
+    keys, sums = sum_by_key(strikes[valid], oi[valid])
+    oi_agg = pd.DataFrame({'strike': keys, 'open_interest_agg': sums})
+    return oi_agg[oi_agg['open_interest_agg'] > 0]  # Drop strikes with zero total OI
 
 # --- App Title and Description ---
 st.title("📊 OpenBB Comprehensive Options Dashboard")
@@ -58,63 +221,52 @@ with st.form("ticker_form"):
     submitted = st.form_submit_button("Fetch Options Data")
 
 # --- Main Logic: Fetch and Display Data ---
+# On submit, record the active ticker and invalidate its stashed chain so the
+# fetch reruns; on widget-triggered reruns (expiration selectbox) the parsed
+# frame is served straight from session state.
 if submitted and ticker_input:
-    ticker = ticker_input.strip().upper()
+    st.session_state['active_ticker'] = ticker_input.strip().upper()
+    st.session_state.pop(f"chain::{st.session_state['active_ticker']}::{DEFAULT_PROVIDER}", None)
+
+ticker = st.session_state.get('active_ticker')
+
+if ticker:
     st.markdown(f"## Options Analysis for: **{ticker}**")
 
     options_df = pd.DataFrame() # Initialize empty dataframe
+    options_cols = frozenset() # Hash-set of columns for the guard clauses below
     underlying_price = None
+    chain_key = f"chain::{ticker}::{DEFAULT_PROVIDER}"
 
     with st.spinner(f"Fetching options chain for {ticker} via {DEFAULT_PROVIDER}..."):
         try:
-            # --- Fetch Options Chain Data ---
-            options_chain_result = obb.derivatives.options.chains(symbol=ticker, provider=DEFAULT_PROVIDER)
-
-            # --- Convert to DataFrame and Clean ---
-            if hasattr(options_chain_result, "to_df") and options_chain_result.results:
-                options_df = options_chain_result.to_df()
-
-                if not options_df.empty:
-                    # Attempt to get underlying price from the result (provider dependent)
-                    if 'underlying_price' in options_df.columns:
-                       underlying_price = safe_get_first(options_df['underlying_price'].dropna())
-                       if underlying_price:
-                           st.metric(label=f"{ticker} Underlying Price", value=f"${underlying_price:,.2f}")
-                       else:
-                           # Fallback if underlying_price column exists but is empty/NaN
-                           st.markdown(f"_(Underlying price not available from {DEFAULT_PROVIDER} for {ticker})_")
-
-
-                    # Standardize and Clean Columns
-                    numeric_cols = [
-                        'strike', 'open_interest', 'volume', 'implied_volatility',
-                        'bid', 'ask', 'last_price', 'underlying_price',
-                        'delta', 'gamma', 'theta', 'vega', 'rho'
-                    ]
-                    for col in numeric_cols:
-                         if col in options_df.columns:
-                             options_df[col] = pd.to_numeric(options_df[col], errors='coerce')
-
-                    # Handle dates (convert to string for selectbox consistency)
-                    if 'expiration' in options_df.columns:
-                        options_df['expiration'] = pd.to_datetime(options_df['expiration'], errors='coerce').dt.strftime('%Y-%m-%d')
-                        options_df.dropna(subset=['expiration'], inplace=True) # Remove rows where expiration conversion failed
-                    else:
-                         st.warning("Column 'expiration' not found. Filtering/Analysis by expiration unavailable.", icon="⚠️")
-
-                    # Format other datetime columns if they exist
-                    for dt_col in ['last_trade_time', 'bid_time', 'ask_time']:
-                         if dt_col in options_df.columns:
-                            options_df[dt_col] = format_datetime_col(options_df, dt_col)
-
+            # --- Fetch Options Chain Data (session-stashed, cached loader) ---
+            if chain_key not in st.session_state:
+                st.session_state[chain_key] = load_chain(ticker, DEFAULT_PROVIDER)
+            options_df, quote_price = st.session_state[chain_key]
+            options_cols = frozenset(options_df.columns)
+
+            if not options_df.empty:
+                # Attempt to get underlying price from the result (provider dependent)
+                if 'underlying_price' in options_cols:
+                   # First non-NaN value straight from the array; no dropna()
+                   # Series materialized just to read one scalar
+                   up = options_df['underlying_price'].to_numpy(dtype=np.float64)
+                   up_mask = ~np.isnan(up)
+                   underlying_price = float(up[up_mask.argmax()]) if up_mask.any() else None
+                if underlying_price is None:
+                    # Fall back to the equity quote fetched concurrently with the chain
+                    underlying_price = quote_price
+                if underlying_price:
+                    st.metric(label=f"{ticker} Underlying Price", value=f"${underlying_price:,.2f}")
                 else:
-                    st.warning(f"Provider '{DEFAULT_PROVIDER}' returned no options contract data for ticker '{ticker}'. The ticker might be invalid or have no listed options.", icon="⚠️")
+                    st.markdown(f"_(Underlying price not available from {DEFAULT_PROVIDER} for {ticker})_")
 
-            else:
-                 st.warning(f"Could not fetch or parse options chain data from '{DEFAULT_PROVIDER}' for '{ticker}'.", icon="⚠️")
-                 # Optional: Print raw result for debugging
-                 # st.write("Raw provider result:", options_chain_result)
+                if 'expiration' not in options_cols:
+                    st.warning("Column 'expiration' not found. Filtering/Analysis by expiration unavailable.", icon="⚠️")
 
+            else:
+                st.warning(f"Provider '{DEFAULT_PROVIDER}' returned no options contract data for ticker '{ticker}'. The ticker might be invalid or have no listed options.", icon="⚠️")
 
         except Exception as e:
             st.error(f"An error occurred while fetching data for {ticker} using provider '{DEFAULT_PROVIDER}':", icon="🚨")
@@ -124,7 +276,7 @@ if submitted and ticker_input:
 
 
     # --- Process and Display Data if DataFrame is populated ---
-    if not options_df.empty and 'expiration' in options_df.columns:
+    if not options_df.empty and 'expiration' in options_cols:
 
         # --- Expiration Date Selector ---
         available_expirations = sorted(options_df['expiration'].unique())
@@ -135,50 +287,115 @@ if submitted and ticker_input:
                 index=min(len(available_expirations) - 1, 2), # Default near-term
                 key=f"expiration_filter_{ticker}"
             )
-            # Filter DataFrame by selected expiration
-            filtered_df = options_df[options_df['expiration'] == selected_expiration].sort_values(by=['strike', 'option_type']).copy()
+            # Look up the pre-sorted partition for the selected expiration
+            groups = load_expiration_groups(ticker, DEFAULT_PROVIDER)
+            filtered_df = groups.get(selected_expiration, pd.DataFrame())
         else:
             st.warning("No valid expiration dates found in the data.", icon="⚠️")
             selected_expiration = None
             filtered_df = pd.DataFrame() # Empty if no valid expirations
 
+        filtered_cols = frozenset(filtered_df.columns)
+
         # --- Display Filtered Options Chain Table ---
         if not filtered_df.empty:
             st.subheader(f"Options Chain for {selected_expiration}")
             # Define columns to display (check if they exist)
             core_cols = ['strike', 'option_type', 'bid', 'ask', 'last_price', 'volume', 'open_interest']
-            iv_col = ['implied_volatility'] if 'implied_volatility' in filtered_df.columns else []
-            greeks_cols = [col for col in ['delta', 'gamma', 'theta', 'vega'] if col in filtered_df.columns]
-            time_cols = ['last_trade_time'] if 'last_trade_time' in filtered_df.columns else []
+            iv_col = ['implied_volatility'] if 'implied_volatility' in filtered_cols else []
+            greeks_cols = [col for col in ['delta', 'gamma', 'theta', 'vega'] if col in filtered_cols]
+            time_cols = ['last_trade_time'] if 'last_trade_time' in filtered_cols else []
 
             display_cols = core_cols + iv_col + greeks_cols + time_cols
-            existing_display_cols = [col for col in display_cols if col in filtered_df.columns]
-
-            # Format numbers for display
-            format_dict = {
-                'strike': '{:.2f}', 'bid': '{:.2f}', 'ask': '{:.2f}', 'last_price': '{:.2f}',
-                'volume': '{:,.0f}', 'open_interest': '{:,.0f}',
-                'implied_volatility': '{:.2%}', # Format as percentage
-                'delta': '{:.3f}', 'gamma': '{:.4f}', 'theta': '{:.3f}', 'vega': '{:.3f}'
+            existing_display_cols = [col for col in display_cols if col in filtered_cols]
+
+            # Column-level display formats: Streamlit's Arrow serializer ships
+            # the raw columns and the front-end formats them, instead of the
+            # per-cell Python Styler loop
+            column_formats = {
+                'strike': st.column_config.NumberColumn(format='%.2f'),
+                'bid': st.column_config.NumberColumn(format='%.2f'),
+                'ask': st.column_config.NumberColumn(format='%.2f'),
+                'last_price': st.column_config.NumberColumn(format='%.2f'),
+                'volume': st.column_config.NumberColumn(format='%d'),
+                'open_interest': st.column_config.NumberColumn(format='%d'),
+                'implied_volatility': st.column_config.NumberColumn(format='percent'),
+                'delta': st.column_config.NumberColumn(format='%.3f'),
+                'gamma': st.column_config.NumberColumn(format='%.4f'),
+                'theta': st.column_config.NumberColumn(format='%.3f'),
+                'vega': st.column_config.NumberColumn(format='%.3f'),
+                'last_trade_time': st.column_config.DatetimeColumn(format='YYYY-MM-DD HH:mm:ss'),
             }
-            existing_format_dict = {k: v for k, v in format_dict.items() if k in existing_display_cols}
+            st.dataframe(
+                filtered_df[existing_display_cols],
+                column_config={k: v for k, v in column_formats.items() if k in existing_display_cols},
+                use_container_width=True,
+                hide_index=True,
+            )
 
-            st.dataframe(filtered_df[existing_display_cols].style.format(existing_format_dict), use_container_width=True)
+            # Opt-in CSV export, formatted column-at-a-time with np.char.mod
+            # rather than a str.format call per cell
+            export_formats = {
+                'strike': '%.2f', 'bid': '%.2f', 'ask': '%.2f', 'last_price': '%.2f',
+                'volume': '%d', 'open_interest': '%d',
+                'delta': '%.3f', 'gamma': '%.4f', 'theta': '%.3f', 'vega': '%.3f'
+            }
+            export_df = filtered_df[existing_display_cols].copy()
+            for col, spec in export_formats.items():
+                if col in existing_display_cols:
+                    values = export_df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                    formatted = np.char.mod(spec, np.nan_to_num(values))
+                    formatted[np.isnan(values)] = ''
+                    export_df[col] = formatted
+            if 'implied_volatility' in existing_display_cols:
+                iv = export_df['implied_volatility'].to_numpy(dtype=np.float64) * 100.0
+                iv_formatted = np.char.mod('%.2f%%', np.nan_to_num(iv))
+                iv_formatted[np.isnan(iv)] = ''
+                export_df['implied_volatility'] = iv_formatted
+            if 'last_trade_time' in existing_display_cols:
+                export_df['last_trade_time'] = export_df['last_trade_time'].dt.strftime('%Y-%m-%d %H:%M:%S').fillna('')
+            st.download_button(
+                "Download chain as CSV",
+                export_df.to_csv(index=False),
+                file_name=f"{ticker}_{selected_expiration}_chain.csv",
+                mime="text/csv",
+            )
 
             # --- Visualizations for Selected Expiration ---
             st.subheader(f"Visualizations for {selected_expiration}")
+
+            # Aggregates for every expiration come from one cached groupby;
+            # the bar charts only slice out the selected date
+            pivot = load_expiration_pivot(ticker, DEFAULT_PROVIDER)
+            pivot_slice = pivot[pivot['expiration'] == selected_expiration] if not pivot.empty else filtered_df
+
+            # Call/put slices once; go.Bar is fed raw arrays below, skipping
+            # Plotly Express's per-row trace-splitting and customdata pass
+            if 'option_type' in pivot_slice.columns:
+                calls = pivot_slice[pivot_slice['option_type'] == 'call']
+                puts = pivot_slice[pivot_slice['option_type'] == 'put']
+            else:
+                calls = puts = pivot_slice
+
             col1, col2 = st.columns(2)
 
             # Plot 1: Open Interest by Strike
             with col1:
-                if 'strike' in filtered_df.columns and 'open_interest' in filtered_df.columns and 'option_type' in filtered_df.columns:
+                if {'strike', 'open_interest', 'option_type'}.issubset(filtered_cols):
                     try:
-                        fig_oi = px.bar(
-                            filtered_df, x='strike', y='open_interest', color='option_type',
-                            barmode='group', title="Open Interest by Strike",
-                            labels={'strike': 'Strike Price', 'open_interest': 'Open Interest', 'option_type': 'Type'},
-                            hover_data=['volume', 'bid', 'ask']
-                        )
+                        oi_hover = ('Strike: %{x}<br>Open Interest: %{y:,}'
+                                    '<br>Volume: %{customdata[0]:,}<br>Bid: %{customdata[1]:.2f}'
+                                    '<br>Ask: %{customdata[2]:.2f}<extra>%{fullData.name}</extra>')
+                        fig_oi = go.Figure([
+                            go.Bar(name=name,
+                                   x=sub['strike'].to_numpy(dtype=np.float64, na_value=np.nan),
+                                   y=sub['open_interest'].to_numpy(dtype=np.float64, na_value=np.nan),
+                                   customdata=sub[['volume', 'bid', 'ask']].to_numpy(dtype=np.float64, na_value=np.nan),
+                                   hovertemplate=oi_hover)
+                            for name, sub in (('call', calls), ('put', puts))
+                        ])
+                        fig_oi.update_layout(barmode='group', title="Open Interest by Strike",
+                                             xaxis_title='Strike Price', yaxis_title='Open Interest')
                         # Add line for underlying price if available
                         if underlying_price:
                              fig_oi.add_vline(x=underlying_price, line_width=2, line_dash="dash", line_color="grey", annotation_text="Underlying Price", annotation_position="top left")
@@ -191,14 +408,21 @@ if submitted and ticker_input:
 
             # Plot 2: Volume by Strike
             with col2:
-                 if 'strike' in filtered_df.columns and 'volume' in filtered_df.columns and 'option_type' in filtered_df.columns:
+                 if {'strike', 'volume', 'option_type'}.issubset(filtered_cols):
                     try:
-                        fig_vol = px.bar(
-                            filtered_df, x='strike', y='volume', color='option_type',
-                            barmode='group', title="Volume by Strike",
-                            labels={'strike': 'Strike Price', 'volume': 'Volume', 'option_type': 'Type'},
-                            hover_data=['open_interest', 'bid', 'ask']
-                        )
+                        vol_hover = ('Strike: %{x}<br>Volume: %{y:,}'
+                                     '<br>Open Interest: %{customdata[0]:,}<br>Bid: %{customdata[1]:.2f}'
+                                     '<br>Ask: %{customdata[2]:.2f}<extra>%{fullData.name}</extra>')
+                        fig_vol = go.Figure([
+                            go.Bar(name=name,
+                                   x=sub['strike'].to_numpy(dtype=np.float64, na_value=np.nan),
+                                   y=sub['volume'].to_numpy(dtype=np.float64, na_value=np.nan),
+                                   customdata=sub[['open_interest', 'bid', 'ask']].to_numpy(dtype=np.float64, na_value=np.nan),
+                                   hovertemplate=vol_hover)
+                            for name, sub in (('call', calls), ('put', puts))
+                        ])
+                        fig_vol.update_layout(barmode='group', title="Volume by Strike",
+                                              xaxis_title='Strike Price', yaxis_title='Volume')
                         if underlying_price:
                              fig_vol.add_vline(x=underlying_price, line_width=2, line_dash="dash", line_color="grey", annotation_text="Underlying Price", annotation_position="top left")
                         fig_vol.update_layout(legend_title_text='Type')
@@ -211,18 +435,22 @@ if submitted and ticker_input:
 
             # Plot 3: Implied Volatility Smile/Skew
             st.markdown("---") # Separator before next plot row
-            if 'strike' in filtered_df.columns and 'implied_volatility' in filtered_df.columns and 'option_type' in filtered_df.columns:
+            if {'strike', 'implied_volatility', 'option_type'}.issubset(filtered_cols):
                 iv_data = filtered_df.dropna(subset=['implied_volatility', 'strike']) # Drop rows where IV or strike is NaN
                 if not iv_data.empty:
                      try:
-                         fig_iv = px.scatter(
-                             iv_data, x='strike', y='implied_volatility', color='option_type',
+                         # WebGL traces: SVG per-point DOM nodes dominate hover/zoom
+                         # latency on deep chains (SPY/QQQ)
+                         fig_iv = go.Figure()
+                         for opt_type, sub in iv_data.groupby('option_type'):
+                             fig_iv.add_trace(go.Scattergl(
+                                 x=sub['strike'], y=sub['implied_volatility'],
+                                 mode='lines+markers', name=opt_type
+                             ))
+                         fig_iv.update_layout(
                              title="Implied Volatility Smile / Skew",
-                             labels={'strike': 'Strike Price', 'implied_volatility': 'Implied Volatility', 'option_type': 'Type'},
-                             hover_data=['open_interest', 'volume', 'delta'] # Show delta on hover if available
+                             xaxis_title='Strike Price', yaxis_title='Implied Volatility'
                          )
-                         # Add lines connecting points for better visualization
-                         fig_iv.update_traces(mode='lines+markers')
                          if underlying_price:
                              fig_iv.add_vline(x=underlying_price, line_width=2, line_dash="dash", line_color="grey", annotation_text="Underlying Price", annotation_position="top left")
                          fig_iv.update_layout(yaxis_tickformat=".1%", legend_title_text='Type') # Format IV axis as percentage
@@ -246,20 +474,19 @@ if submitted and ticker_input:
         st.markdown("Sum of open interest for each strike price over *all* fetched contract expiration dates.")
 
         try:
-            # Calculate aggregate from the original, full options_df
-            if 'strike' in options_df.columns and 'open_interest' in options_df.columns:
-                # Ensure OI is numeric, fill NaNs with 0 for summation
-                options_df['open_interest_agg'] = pd.to_numeric(options_df['open_interest'], errors='coerce').fillna(0)
-                oi_agg = options_df.groupby('strike', as_index=False)['open_interest_agg'].sum()
-                oi_agg = oi_agg[oi_agg['open_interest_agg'] > 0] # Filter out strikes with zero total OI
+            if {'strike', 'open_interest'}.issubset(options_cols):
+                # Memoized per fetch; reruns from widget changes hit the cache
+                oi_agg = aggregate_oi(ticker, DEFAULT_PROVIDER)
 
                 if not oi_agg.empty:
                      # Display aggregated data table (optional)
                      # st.dataframe(oi_agg.style.format({'strike': '{:.2f}', 'open_interest_agg': '{:,.0f}'}))
 
-                     # Plot Aggregated OI
+                     # Plot Aggregated OI (downsampled when chains are fat, e.g.
+                     # multi-year LEAPS, to cap the payload sent to the browser)
+                     oi_plot = lttb_downsample(oi_agg.sort_values('strike'), 'strike', 'open_interest_agg')
                      fig_oi_agg = px.bar(
-                         oi_agg.sort_values('strike'), x='strike', y='open_interest_agg',
+                         oi_plot, x='strike', y='open_interest_agg',
                          title=f"Total Open Interest by Strike (All Expirations)",
                          labels={'strike': 'Strike Price', 'open_interest_agg': 'Total Open Interest'}
                      )
@@ -276,14 +503,14 @@ if submitted and ticker_input:
              st.warning(f"Could not calculate or plot aggregated open interest: {agg_ex}", icon="⚠️")
 
     # --- Messages for Empty Initial Fetch or Missing Expiration ---
-    elif submitted and ticker: # If submitted but options_df ended up empty or without 'expiration'
+    else: # options_df ended up empty or without 'expiration'
          st.warning(f"Could not display options data for '{ticker}'. Check fetch errors/warnings above.", icon="⚠️")
-    elif submitted and not ticker_input: # If submitted with no ticker
-         st.warning("Please enter a ticker symbol.", icon="⚠️")
 
+elif submitted and not ticker_input: # If submitted with no ticker
+    st.warning("Please enter a ticker symbol.", icon="⚠️")
 
 # --- Initial State Message ---
-elif not submitted:
+else:
     st.info("Enter a ticker symbol above and click 'Fetch Options Data' to begin.", icon="👋")
 
 # --- Footer ---